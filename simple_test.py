@@ -13,6 +13,12 @@ import aiohttp
 sys.path.insert(0, str(Path(__file__).parent))
 
 
+async def _probe(session, url):
+    """Request a URL's headers and return its status code."""
+    async with session.head(url, allow_redirects=True) as response:
+        return response.status
+
+
 async def test_basic_connectivity():
     """Test basic internet connectivity."""
     print("Testing basic connectivity...")
@@ -23,13 +29,22 @@ async def test_basic_connectivity():
         ("Kraken", "https://api.kraken.com")
     ]
     
-    async with aiohttp.ClientSession() as session:
-        for name, url in urls:
-            try:
-                async with session.get(url, timeout=5) as response:
-                    print(f"✅ {name}: {response.status}")
-            except Exception as e:
-                print(f"❌ {name}: {e}")
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=5)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Probe all hosts at once so the test takes the slowest latency, not the sum
+        results = await asyncio.gather(
+            *(_probe(session, url) for _, url in urls),
+            return_exceptions=True
+        )
+    
+    for (name, _), result in zip(urls, results):
+        if isinstance(result, Exception):
+            print(f"❌ {name}: {result}")
+        elif result < 400:
+            print(f"✅ {name}: {result}")
+        else:
+            print(f"⚠️  {name}: {result}")
 
 
 def test_config_parsing():
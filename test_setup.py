@@ -7,27 +7,37 @@ import os
 import sys
 import asyncio
 from datetime import datetime
-from colorlog import ColoredFormatter
+from importlib.util import find_spec
 import logging
-import psycopg2
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+
+class ColoredFormatter(logging.Formatter):
+    """Formatter that colors each record by level using ANSI escapes."""
+    
+    COLORS = {
+        'DEBUG': '\x1b[36m',  # cyan
+        'INFO': '\x1b[32m',  # green
+        'WARNING': '\x1b[33m',  # yellow
+        'ERROR': '\x1b[31m',  # red
+        'CRITICAL': '\x1b[31;47m',  # red on white
+    }
+    RESET = '\x1b[0m'
+    
+    def format(self, record):
+        color = self.COLORS.get(record.levelname, '')
+        return f"{color}{super().format(record)}{self.RESET}"
+
+
 # Setup colored logging
 def setup_logging():
     """Setup colored logging for better visibility."""
     handler = logging.StreamHandler()
     handler.setFormatter(ColoredFormatter(
-        '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-        }
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     ))
     
     logger = logging.getLogger()
@@ -39,8 +49,12 @@ def setup_logging():
 logger = setup_logging()
 
 
-def test_imports():
-    """Test that all required packages can be imported."""
+def test_imports(deep=False):
+    """Test that all required packages are installed.
+    
+    Packages are only located, not executed; pass deep=True (--deep on the
+    command line) to actually import each one.
+    """
     logger.info("Testing package imports...")
     
     required_packages = [
@@ -50,18 +64,24 @@ def test_imports():
         'psycopg2',
         'redis',
         'dotenv',
-        'colorlog',
+        'fastjsonschema',
         'websockets',
         'aiohttp'
     ]
     
     failed = []
     for package in required_packages:
-        try:
-            __import__(package)
-            logger.info(f"✅ {package} imported successfully")
-        except ImportError as e:
-            logger.error(f"❌ Failed to import {package}: {e}")
+        if deep:
+            try:
+                __import__(package)
+                logger.info(f"✅ {package} imported successfully")
+            except ImportError as e:
+                logger.error(f"❌ Failed to import {package}: {e}")
+                failed.append(package)
+        elif find_spec(package) is not None:
+            logger.info(f"✅ {package} is installed")
+        else:
+            logger.error(f"❌ {package} is not installed")
             failed.append(package)
     
     return len(failed) == 0
@@ -110,6 +130,7 @@ def test_database():
     logger.info("\nTesting database connection...")
     
     try:
+        import psycopg2
         from config import config
         
         # Parse database URL
@@ -118,16 +139,17 @@ def test_database():
         cursor = conn.cursor()
         
         # Test query
-        cursor.execute("SELECT version();")
+        cursor.execute("SHOW server_version;")
         version = cursor.fetchone()[0]
-        logger.info(f"✅ PostgreSQL connected: {version}")
+        logger.info(f"✅ PostgreSQL {version} connected")
         
-        # Check tables exist
+        # Check tables exist (ordinary tables only; views and foreign tables are not listed)
         cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-            ORDER BY table_name;
+            SELECT c.relname
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind = 'r'
+            ORDER BY c.relname;
         """)
         
         tables = cursor.fetchall()
@@ -151,6 +173,51 @@ def test_database():
         return False
 
 
+async def _probe_exchange(name, exchange_class, get_exchange_config):
+    """Fetch a ticker (and the balance in live mode) from one exchange."""
+    from config import config
+    
+    logger.info(f"Testing {name} API...")
+    
+    exchange = None
+    
+    try:
+        # Create exchange instance with timeout
+        exchange_cfg = {**get_exchange_config(), 'timeout': 10000}  # 10 second timeout
+        
+        exchange = exchange_class(exchange_cfg)
+        
+        # Simple test - just fetch one ticker without loading all markets
+        logger.info(f"Fetching {name} BTC/USD ticker...")
+        
+        # Use asyncio.wait_for to add timeout
+        ticker = await asyncio.wait_for(
+            exchange.fetch_ticker('BTC/USD'),
+            timeout=15.0
+        )
+        logger.info(f"✅ {name} public API working - BTC/USD: ${ticker['last']:,.2f}")
+        
+        # Test private endpoint (if in live mode)
+        if config.trading_mode == "live":
+            logger.info(f"Testing {name} private API...")
+            await asyncio.wait_for(
+                exchange.fetch_balance(),
+                timeout=15.0
+            )
+            logger.info(f"✅ {name} private API working")
+        
+        return True
+    except asyncio.TimeoutError:
+        logger.error(f"❌ {name} API timeout - check your internet connection")
+        return False
+    except Exception as e:
+        logger.error(f"❌ {name} API error: {e}")
+        return False
+    finally:
+        if exchange is not None:
+            await exchange.close()
+
+
 async def test_exchange_connections():
     """Test exchange API connections."""
     logger.info("\nTesting exchange connections...")
@@ -159,95 +226,28 @@ async def test_exchange_connections():
         import ccxt.async_support as ccxt
         from config import config, exchange_config
         
-        results = []
+        probes = []
         
         # Test Coinbase
-        if "coinbase" in config.active_exchanges:
+        if "coinbase" in config.active_exchanges_set:
             if config.coinbase_api_key:
-                logger.info("Testing Coinbase API...")
-                
-                # Create exchange instance with specific settings
-                coinbase_config = exchange_config.get_coinbase_config()
-                coinbase_config['options']['defaultType'] = 'spot'
-                coinbase_config['timeout'] = 10000  # 10 second timeout
-                
-                exchange = ccxt.coinbase(coinbase_config)
-                
-                try:
-                    # Simple test - just fetch one ticker without loading all markets
-                    logger.info("Fetching BTC/USD ticker...")
-                    
-                    # Use asyncio.wait_for to add timeout
-                    ticker = await asyncio.wait_for(
-                        exchange.fetch_ticker('BTC/USD'),
-                        timeout=15.0
-                    )
-                    logger.info(f"✅ Coinbase public API working - BTC/USD: ${ticker['last']:,.2f}")
-                    
-                    # Test private endpoint (if in live mode)
-                    if config.trading_mode == "live":
-                        logger.info("Testing private API...")
-                        balance = await asyncio.wait_for(
-                            exchange.fetch_balance(),
-                            timeout=15.0
-                        )
-                        logger.info("✅ Coinbase private API working")
-                    
-                    results.append(True)
-                except asyncio.TimeoutError:
-                    logger.error("❌ Coinbase API timeout - check your internet connection")
-                    results.append(False)
-                except Exception as e:
-                    logger.error(f"❌ Coinbase API error: {e}")
-                    results.append(False)
-                finally:
-                    await exchange.close()
+                probes.append(_probe_exchange("Coinbase", ccxt.coinbase, exchange_config.get_coinbase_config))
             else:
                 logger.warning("⚠️  Coinbase API key not set")
         
         # Test Kraken
-        if "kraken" in config.active_exchanges:
+        if "kraken" in config.active_exchanges_set:
             if config.kraken_api_key:
-                logger.info("\nTesting Kraken API...")
-                
-                # Create exchange instance with timeout
-                kraken_config = exchange_config.get_kraken_config()
-                kraken_config['timeout'] = 10000  # 10 second timeout
-                
-                exchange = ccxt.kraken(kraken_config)
-                
-                try:
-                    # Simple test - just fetch one ticker
-                    logger.info("Fetching BTC/USD ticker...")
-                    
-                    ticker = await asyncio.wait_for(
-                        exchange.fetch_ticker('BTC/USD'),
-                        timeout=15.0
-                    )
-                    logger.info(f"✅ Kraken public API working - BTC/USD: ${ticker['last']:,.2f}")
-                    
-                    # Test private endpoint (if in live mode)
-                    if config.trading_mode == "live":
-                        logger.info("Testing private API...")
-                        balance = await asyncio.wait_for(
-                            exchange.fetch_balance(),
-                            timeout=15.0
-                        )
-                        logger.info("✅ Kraken private API working")
-                    
-                    results.append(True)
-                except asyncio.TimeoutError:
-                    logger.error("❌ Kraken API timeout - check your internet connection")
-                    results.append(False)
-                except Exception as e:
-                    logger.error(f"❌ Kraken API error: {e}")
-                    results.append(False)
-                finally:
-                    await exchange.close()
+                probes.append(_probe_exchange("Kraken", ccxt.kraken, exchange_config.get_kraken_config))
             else:
                 logger.warning("⚠️  Kraken API key not set")
         
-        return all(results) if results else True
+        # Each probe closes its own exchange, so one failure cannot leak the other's sockets
+        results = await asyncio.gather(*probes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Exchange test error: {result}")
+        return all(result is True for result in results)
         
     except Exception as e:
         logger.error(f"❌ Exchange test error: {e}")
@@ -280,7 +280,7 @@ async def main():
     results = []
     
     # Run tests
-    results.append(("Package Imports", test_imports()))
+    results.append(("Package Imports", test_imports(deep="--deep" in sys.argv)))
     results.append(("Environment Config", test_environment()))
     results.append(("Directories", test_directories()))
     results.append(("Database", test_database()))